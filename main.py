@@ -15,15 +15,37 @@ Features:
 - File Handling: Load and save the product database to different files.
 """
 import tkinter as tk
-from tkinter import ttk, messagebox, filedialog, colorchooser
+import tkinter.font as tkfont
+from tkinter import ttk, messagebox, filedialog
 import datetime
-import uuid
+import functools
+import hashlib
+import math
+import mmap
+import atexit
+import secrets
 import os
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import json
+import locale
 import csv
 import collections
+import io
+import re
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+# orjson is optional: it parses and serializes products several times faster than the stdlib json module.
+# Both paths take and return bytes so files are read and written without a separate decode/encode step.
+try:
+    import orjson
+    json_loads = orjson.loads
+    def json_dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    json_loads = json.loads
+    def json_dumps(obj):
+        return json.dumps(obj, indent=2).encode('utf-8')
 
 # File path for user-defined custom categories
 CUSTOM_CATEGORIES_FILE = os.path.join('datas', 'custom_categories.json')
@@ -54,26 +76,46 @@ CATEGORY_TREE = {
     "Other": ["Other"]
 }
 
-# On startup, load custom categories and merge with CATEGORY_TREE
+# Custom categories are loaded on first use and merged with CATEGORY_TREE
 # This allows users to extend the category system without losing defaults
 
 def load_custom_categories():
     # Loads user-defined categories from a JSON file if it exists
     if os.path.exists(CUSTOM_CATEGORIES_FILE):
-        with open(CUSTOM_CATEGORIES_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        with open(CUSTOM_CATEGORIES_FILE, 'rb') as f:
+            return json_loads(f.read())
     return {}
 
-def save_custom_categories(custom_tree):
-    # Saves the current custom category tree to disk
-    with open(CUSTOM_CATEGORIES_FILE, 'w', encoding='utf-8') as f:
-        json.dump(custom_tree, f, indent=2)
+# In-memory copy of the custom categories file: read on first use, then replaced by each save
+custom_category_tree = None
+
+def get_custom_categories():
+    # Returns the custom category tree, reading the file only the first time
+    global custom_category_tree
+    if custom_category_tree is None:
+        custom_category_tree = load_custom_categories()
+    return custom_category_tree
 
-# Merge default and custom trees
+def save_custom_categories(custom_tree):
+    # Saves the current custom category tree to disk and makes it the in-memory copy
+    global custom_category_tree
+    with open(CUSTOM_CATEGORIES_FILE, 'wb') as f:
+        f.write(json_dumps(custom_tree))
+    custom_category_tree = custom_tree
+    invalidate_category_cache()
+
+def invalidate_category_cache():
+    # Forces the next get_full_category_tree() call to re-merge the custom categories
+    get_full_category_tree.cache_clear()
+    get_category_choices.cache_clear()
+
+# Merge default and custom trees. Cached: the result only changes when custom categories are saved,
+# so callers share one dict and must not modify it.
+@functools.lru_cache(maxsize=1)
 def get_full_category_tree():
     # Start with a copy of the default tree
     tree = {k: v[:] for k, v in CATEGORY_TREE.items()}
-    custom = load_custom_categories()
+    custom = get_custom_categories()
     for main, subs in custom.items():
         if main not in tree:
             tree[main] = []
@@ -82,7 +124,10 @@ def get_full_category_tree():
                 tree[main].append(sub)
     return tree
 
-CATEGORY_TREE = get_full_category_tree()
+@functools.lru_cache(maxsize=1)
+def get_category_choices():
+    # Sub-category choices per main category, ready to hand to a Combobox without copying
+    return {main: tuple(subs) for main, subs in get_full_category_tree().items()}
 
 # --- CONFIGURATION & STYLING ---
 # Centralized configuration for easy customization
@@ -91,7 +136,296 @@ CONFIG = {
     "currency_symbol": "$",
     "products_file": os.path.join('datas', 'products.txt'),
     "sales_file": os.path.join('datas', 'sales.txt'),
+    # Parsed copy of sales_file plus the byte offset it covers, so only new sales are parsed
+    "sales_index_file": os.path.join('datas', 'sales_index.json'),
+}
+
+# Bound once at import so hot paths skip the CONFIG lookup; re-bind if CONFIG is changed at runtime
+CURRENCY = CONFIG['currency_symbol']
+TAX_RATE = CONFIG['tax_rate']
+
+# Product files larger than this are parsed on a worker thread so the window stays responsive
+LARGE_FILE_BYTES = 1024 * 1024
+
+# The Product Manager inserts this many rows at once and the rest on later idle ticks
+PRODUCT_ROWS_PER_BATCH = 500
+
+# Pipe-delimited layout of the TXT products file (read and written with the csv module)
+# No quoting or escaping, exactly like the original '|'.join / split('|'): backslashes and quotes are plain text
+TXT_DIALECT = {'delimiter': '|', 'quoting': csv.QUOTE_NONE, 'quotechar': None, 'escapechar': None, 'lineterminator': '\n'}
+# Characters a TXT products field cannot hold, since the format has no way to escape them
+TXT_FORBIDDEN = re.compile(r'[|\r\n]')
+
+def new_product_ids(batch=256):
+    """Yield fresh 'prod_xxxxxxxx' ids, drawing random bytes for a batch of ids at a time instead of one call per id."""
+    while True:
+        pool = secrets.token_hex(4 * batch)
+        for i in range(0, len(pool), 8):
+            yield f"prod_{pool[i:i + 8]}"
+
+def cache_display_strings(product):
+    # Precomputes the formatted price and button label so redraws skip float formatting.
+    # Call again whenever the product's name or price changes.
+    product['_price_str'] = f"{product['price']:.2f}"
+    product['_btn_text'] = f"{product['name']}\n{CURRENCY}{product['_price_str']}"
+    return product
+
+def strip_cached_fields(products):
+    # Returns copies of the products without the underscore-prefixed display caches, for saving
+    return [{k: v for k, v in p.items() if not k.startswith('_')} for p in products]
+
+def write_products(path, products):
+    # Writes products to a JSON, CSV, YAML, or (otherwise) pipe-delimited TXT file, chosen by extension.
+    # Touches no app or Tk state, so it can run on the pool with a snapshot of the products.
+    if path.endswith('.json'):
+        # Serialize to bytes, then one write: json.dump would issue a write per encoded chunk
+        payload = json_dumps(strip_cached_fields(products))
+        with open(path, 'wb') as f:
+            f.write(payload)
+    elif path.endswith('.csv'):
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            fieldnames = ['id','name','category','category_main','category_sub','type','price','stock','unit','description']
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(products)
+    elif path.endswith('.yaml') or path.endswith('.yml'):
+        import yaml
+        with open(path, 'w', encoding='utf-8') as f:
+            yaml.safe_dump(strip_cached_fields(products), f, allow_unicode=True)
+    else:
+        rows = [(product['id'], product['name'], product.get('category',''), product.get('type','product'),
+                 product.get('price',0.0), product.get('stock',0), product.get('unit','pcs'), product.get('description',''))
+                for product in products]
+        # Refuse rather than mangle: a '|' or line break would split the row when the file is read back
+        for row in rows:
+            for field in row:
+                if isinstance(field, str) and TXT_FORBIDDEN.search(field):
+                    raise ValueError(f"Item '{row[0]}' has a '|' or line break in {field!r}, which a TXT products file cannot store")
+        # Format every row in memory, then write the file in one call
+        buf = io.StringIO()
+        csv.writer(buf, **TXT_DIALECT).writerows(rows)
+        with open(path, 'w', encoding='utf-8', newline='') as f:
+            f.write(buf.getvalue())
+
+# Fixed pieces of the printed receipt
+RECEIPT_HEADER = "*** SALE RECEIPT ***\n\n"
+RECEIPT_RULE = "-" * 40 + "\n"
+RECEIPT_FOOTER = "*** Thank You! ***"
+
+# --- SALES LOG PARSING ---
+# sales.txt holds one block per sale, from a SALE START line to a SALE END line
+SALE_START = b'--- SALE START ---'
+SALE_END = b'--- SALE END ---'
+# Templates for one sale block in the sales log; the inverse of parse_sales_log
+SALE_FMT = ("--- SALE START ---\nID: {sale_id}\nTIMESTAMP: {timestamp}\n{items}"
+            "SUBTOTAL: {subtotal:.2f}\nTOTAL: {total:.2f}\nTENDERED: {tendered:.2f}\n--- SALE END ---\n\n")
+SALE_ITEM_FMT = "ITEM: {id}|{name}|{quantity}|{price}|{type}|{unit}\n"
+SALE_FIELD_RE = re.compile(rb'^(ID|TIMESTAMP|ITEM|SUBTOTAL|TOTAL|TENDERED): (.*?)\s*$', re.M)
+# Older versions wrote the sales log in the platform's default encoding (e.g. cp1252 on Windows)
+LEGACY_LOG_ENCODING = locale.getpreferredencoding(False)
+
+def decode_log_value(value):
+    # Decodes one sales log field: UTF-8 as written now, else the legacy encoding, never raising,
+    # so one old non-ASCII name cannot make the whole log unreadable
+    try:
+        return value.decode('utf-8')
+    except UnicodeDecodeError:
+        return value.decode(LEGACY_LOG_ENCODING, errors='replace')
+
+# Sale dict key and converter for every single-valued field in a sale block
+SALE_FIELDS = {
+    b'ID': ('sale_id', decode_log_value),
+    b'TIMESTAMP': ('timestamp', decode_log_value),
+    b'SUBTOTAL': ('subtotal', float),
+    b'TOTAL': ('total', float),
+    b'TENDERED': ('cash_tendered', float),
 }
+# Characters that make csv.writer quote a field; exports without them are written with plain joins
+CSV_SPECIAL = re.compile(r'[,"\r\n]')
+
+def parse_sale_item(parts):
+    # Builds a cart-style item from an ITEM line split on '|': id|name|qty|price|type|unit (type/unit optional)
+    return {
+        'id': parts[0] if len(parts) > 0 else '',
+        'name': parts[1] if len(parts) > 1 else '',
+        'quantity': int(parts[2]) if len(parts) > 2 else 0,
+        'price': float(parts[3]) if len(parts) > 3 else 0.0,
+        'type': parts[4] if len(parts) > 4 else 'product',
+        'unit': parts[5] if len(parts) > 5 else '',
+    }
+
+def parse_sale_block(block):
+    # Extracts one sale's fields from the bytes between a SALE START and SALE END with one regex scan.
+    # Returns None for a block without any fields.
+    sale = {}
+    items = []
+    for key, value in SALE_FIELD_RE.findall(block):
+        if key == b'ITEM':
+            items.append(parse_sale_item(decode_log_value(value).split('|')))
+        else:
+            field, convert = SALE_FIELDS[key]
+            sale[field] = convert(value)
+    if not sale:
+        return None
+    sale['items'] = items
+    # Calculate tax if possible
+    if 'total' in sale and 'subtotal' in sale:
+        sale['tax'] = sale['total'] - sale['subtotal']
+    else:
+        sale['tax'] = 0.0
+    return sale
+
+def parse_sales_log(path, offset=0):
+    # Reads the sales log from a byte offset in one go and returns (sales, next_offset).
+    # next_offset points just past the last complete block, so a sale still being written is
+    # picked up by the next call. Blocks missing their SALE END line are skipped.
+    # The file is memory-mapped and searched in place, so only the bytes of each block are copied.
+    if not os.path.exists(path):
+        return [], 0
+    with open(path, 'rb') as f:
+        size = os.fstat(f.fileno()).st_size
+        if size <= offset:
+            return [], offset
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            end = mm.rfind(SALE_END, offset)
+            if end == -1:
+                return [], offset
+            cut = mm.find(b'\n', end)
+            cut = size if cut == -1 else cut + 1
+            # Include the blank line(s) that follow a block, so a fully parsed log ends exactly at next_offset
+            while cut < size and mm[cut] in b'\r\n':
+                cut += 1
+            sales = []
+            start = mm.find(SALE_START, offset, cut)
+            while start != -1:
+                next_start = mm.find(SALE_START, start + len(SALE_START), cut)
+                block = mm[start + len(SALE_START):cut if next_start == -1 else next_start]
+                if SALE_END in block:
+                    sale = parse_sale_block(block)
+                    if sale:
+                        sales.append(sale)
+                start = next_start
+    return sales, cut
+
+# How much of the sales log's start is hashed to recognise it; appends never change these bytes
+SALES_SIGNATURE_BYTES = 4096
+
+def sales_log_signature(path, length):
+    # Returns [inode, length, hash of the first `length` bytes]. A replaced or rewritten log
+    # (restored backup, another store's file, a manual edit) almost always differs in one of them.
+    with open(path, 'rb') as f:
+        head = f.read(length)
+        return [os.fstat(f.fileno()).st_ino, len(head), hashlib.blake2b(head, digest_size=16).hexdigest()]
+
+def sales_log_stamp(path):
+    # Returns (size, mtime) of the sales log, or None if there is none: a cheap, lock-free way to
+    # tell whether it changed since the sales tabs last loaded
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_size, st.st_mtime_ns
+
+def daily_totals(sales):
+    # Returns (days, totals): the sorted 'YYYY-MM-DD' dates that have sales and each day's summed total,
+    # grouped with numpy rather than a per-sale dict update
+    import numpy as np
+    days = np.array([sale.get('timestamp', '')[:10] for sale in sales], dtype='U10')
+    totals = np.fromiter((sale.get('total', 0.0) for sale in sales), dtype=np.float64, count=len(sales))
+    unique_days, day_index = np.unique(days, return_inverse=True)
+    return unique_days, np.bincount(day_index, weights=totals, minlength=len(unique_days))
+
+def aggregate_sales(sales):
+    # Computes the Analytics tab figures in one pass over the sales and their items:
+    # the 10 best-selling products, quantity sold per item type, and (via daily_totals) sales total per day.
+    product_counter = collections.Counter()
+    type_counter = collections.Counter()
+    for sale in sales:
+        for item in sale.get('items', ()):
+            quantity = item['quantity']
+            product_counter[item['name']] += quantity
+            type_counter[item.get('type', 'product')] += quantity
+    return product_counter.most_common(10), type_counter, daily_totals(sales)
+
+# The Sales Over Time chart plots one point per day, and past CHART_MAX_POINTS days keeps the
+# lowest and highest day of each of CHART_BUCKETS buckets so the shape of the series survives
+CHART_MAX_POINTS = 2000
+CHART_BUCKETS = 1000
+
+def minmax_downsample(x, y, buckets):
+    # Keeps the minimum and maximum of y in each of `buckets` equal slices of the (sorted) series, in x order
+    import numpy as np
+    edges = np.linspace(0, len(y), buckets + 1).astype(int)
+    keep = []
+    for start, stop in zip(edges[:-1], edges[1:]):
+        if stop > start:
+            chunk = y[start:stop]
+            keep.extend(sorted({start + int(chunk.argmin()), start + int(chunk.argmax())}))
+    return x[keep], y[keep]
+
+# --- PRODUCT FILE LOADING ---
+# Each loader returns the file's raw item dicts; normalize_product turns them into products
+def load_json_items(path):
+    with open(path, 'rb') as f:
+        return json_loads(f.read())
+
+def load_csv_items(path):
+    # csv.reader plus one zip per row with the header, instead of DictReader's per-row Python bookkeeping
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        return [dict(zip(header, row)) for row in reader if row]
+
+def load_yaml_items(path):
+    import yaml
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f)
+
+def load_txt_items(path):
+    # Pipe-delimited, legacy (id|name|price|stock) and new (id|name|category|type|price|stock|unit|description) format
+    items = []
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        for parts in csv.reader(f, **TXT_DIALECT):
+            if len(parts) == 4:
+                items.append(dict(zip(('id', 'name', 'price', 'stock'), parts)))
+            elif len(parts) >= 8:
+                items.append(dict(zip(('id', 'name', 'category', 'type', 'price', 'stock', 'unit', 'description'), parts)))
+    return items
+
+PRODUCT_LOADERS = {'.json': load_json_items, '.csv': load_csv_items, '.yaml': load_yaml_items, '.yml': load_yaml_items}
+
+def intern_str(value):
+    # Interns strings so every product shares one object per distinct value; anything else is returned as is
+    return sys.intern(value) if type(value) is str else value
+
+def normalize_product(item, new_ids):
+    # Builds a product from any loader's item, accepting both 'id' and 'product_id' and all category fields.
+    # The few-valued fields (type, unit, categories) are interned; name and description are mostly unique.
+    get = item.get
+    category = intern_str(get('category', ''))
+    return {
+        'id': get('id') or get('product_id') or next(new_ids),
+        'name': get('name', 'Unknown'),
+        'category': category,
+        'category_main': intern_str(get('category_main', category)),
+        'category_sub': intern_str(get('category_sub', '')),
+        'type': intern_str(get('type', 'product')),
+        'price': float(get('price', 0.0)),
+        'stock': int(get('stock', 0)),
+        'unit': intern_str(get('unit', 'pcs')),
+        'description': get('description', ''),
+    }
+
+def insert_rows(tree, rows):
+    # Appends value tuples to a Treeview with its columns hidden, so Tk lays the rows out once
+    displaycolumns = tree['displaycolumns']
+    tree.configure(displaycolumns=())
+    try:
+        insert = tree.insert
+        for values in rows:
+            insert('', 'end', values=values)
+    finally:
+        tree.configure(displaycolumns=displaycolumns)
 
 # Modern color scheme for a professional look
 COLORS = {
@@ -116,9 +450,36 @@ class POSApp:
         self.root.configure(bg=COLORS['light_bg'])
 
         self.products = []
-        self.cart = []
-        self.product_buttons = []
+        self.products_by_id = {}  # product id -> product dict, rebuilt on load and kept in sync by ProductManager
+        self.cart = {}  # product id -> cart item, in insertion order
+        self._subtotal = 0.0  # running cart subtotal, updated by delta
+        self._stale_cart_rows = set()  # ids of cart rows whose quantity changed since the last redraw
+        self._cart_update_job = None  # Pending after() id that redraws stale rows and the totals
+        self.product_buttons = {}  # product id -> tk.Button currently showing it
+        self._button_pool = []  # Reusable product buttons, never destroyed
+        self._button_state = {}  # button -> (product, text, low_stock) it was last configured with
+        self._visible_buttons = 0  # Number of pool buttons currently gridded
         
+        self._io_pool = ThreadPoolExecutor(max_workers=2)  # File parsing off the Tk thread
+        self._sales_lock = threading.Lock()  # Held while the pool parses the log; never taken on the Tk thread
+        self._sales_fh = None  # Append handle for the sales log, opened on the first sale
+        self._sales_write_lock = threading.Lock()
+        self._products_dirty = False  # A deferred product save has been requested but not started
+        self._products_save_future = None  # The deferred product save currently running on the pool
+        atexit.register(self._flush_products_save)
+        self._sales_cache = None  # Loaded from the sidecar by the first get_sales, on the pool
+        self._pending_sales = collections.deque()  # (start, end, sale) for blocks checkout appended to the log
+        self._io_pool.submit(self.get_sales)  # Load the sidecar and parse new sales while the window opens
+        self._summary_stamp = None  # sales_log_stamp() when the summary tab last loaded its sales
+        self._summary_loading = False
+        self._summary_started = False  # The summary tab (and matplotlib) load on its first visit
+        self._analytics_started = False
+        self._analytics_loading = False
+        self._analytics_stamp = None  # sales_log_stamp() when the analytics tab last loaded its sales
+        self._summary_fig = None
+        self._summary_canvas = None  # Chart canvas, kept and updated in place once built
+        self._summary_sales = []  # Sales currently listed in the summary log
+
         self.setup_styles()
         self.create_notebook()
         self.load_data()
@@ -128,6 +489,19 @@ class POSApp:
         style = ttk.Style(self.root)
         style.theme_use('clam')
 
+        # Named fonts, created once and shared by every widget that uses them
+        self.fonts = {
+            'product': tkfont.Font(self.root, family='Segoe UI', size=10),
+            'heading': tkfont.Font(self.root, family='Segoe UI', size=14, weight='bold'),
+            'section': tkfont.Font(self.root, family='Segoe UI', size=12, weight='bold'),
+            'label': tkfont.Font(self.root, family='Segoe UI', size=11),
+            'label_bold': tkfont.Font(self.root, family='Segoe UI', size=11, weight='bold'),
+            'body': tkfont.Font(self.root, family='Segoe UI', size=10),
+            'large': tkfont.Font(self.root, family='Segoe UI', size=12),
+            'italic': tkfont.Font(self.root, family='Segoe UI', size=9, slant='italic'),
+            'total': tkfont.Font(self.root, family='Segoe UI', size=14, weight='bold'),
+        }
+
         # General styles
         style.configure('TFrame', background=COLORS['light_bg'])
         style.configure('TLabel', background=COLORS['light_bg'], foreground=COLORS['dark_text'], font=('Segoe UI', 10))
@@ -155,16 +529,105 @@ class POSApp:
         self.create_widgets(self.pos_frame)
         # Sales Summary Tab
         self.summary_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.summary_frame, text="Sales Summary")
-        self.create_sales_summary(self.summary_frame)
+        self.notebook.add(self.summary_frame, text="Sales Summary")  # Built on first visit, see on_tab_changed
         # Analytics Tab
         self.analytics_frame = ttk.Frame(self.notebook)
-        self.notebook.add(self.analytics_frame, text="Analytics")
-        self.create_analytics_tab(self.analytics_frame)
+        self.notebook.add(self.analytics_frame, text="Analytics")  # Built on first visit, see on_tab_changed
         # IMS Sync Tab
         self.sync_frame = ttk.Frame(self.notebook)
         self.notebook.add(self.sync_frame, text="IMS Sync")
         self.create_sync_tab(self.sync_frame)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+
+    def on_tab_changed(self, event=None):
+        """Build the sales tabs on their first visit, then refresh them when new sales were logged since."""
+        selected = self.notebook.select()
+        if selected == str(self.summary_frame):
+            self.show_summary_tab()
+        elif selected == str(self.analytics_frame):
+            self.show_analytics_tab()
+
+    def show_analytics_tab(self):
+        if self._analytics_loading:
+            return
+        # Compared with a stat of the log rather than get_sales(), which could wait on a parse in progress
+        stamp = sales_log_stamp(CONFIG['sales_file'])
+        if self._analytics_started and stamp == self._analytics_stamp:
+            return
+        self._analytics_started = True
+        self._analytics_stamp = stamp
+        self.create_analytics_tab(self.analytics_frame)
+
+    def show_summary_tab(self):
+        if self._summary_loading:
+            return
+        stamp = sales_log_stamp(CONFIG['sales_file'])
+        if not self._summary_started:
+            self._summary_started = True
+            self._summary_stamp = stamp
+            self.create_sales_summary(self.summary_frame)
+            return
+        if stamp == self._summary_stamp:
+            return
+        self._summary_stamp = stamp
+        self._summary_loading = True
+        future = self._io_pool.submit(self._summary_data)
+        future.add_done_callback(lambda f: self.root.after(0, self._update_summary, f))
+
+    # --- SALES LOG CACHE ---
+    def load_sales_index(self):
+        """Load the parsed-sales sidecar, or start empty if it is missing, unreadable, or for another log."""
+        empty = {'sales_file': CONFIG['sales_file'], 'last_offset': 0, 'sales': [], 'signature': None}
+        try:
+            with open(CONFIG['sales_index_file'], 'rb') as f:
+                cache = json_loads(f.read())
+        except (OSError, ValueError):
+            return empty
+        if cache.get('sales_file') != CONFIG['sales_file'] or not isinstance(cache.get('sales'), list):
+            return empty
+        return cache
+
+    def get_sales(self):
+        """Return every logged sale, parsing only the part of the sales file appended since the last call.
+        Called on the pool only: it can hold _sales_lock for a whole parse."""
+        with self._sales_lock:
+            return self._update_sales_cache()
+
+    def _update_sales_cache(self):
+        if self._sales_cache is None:
+            self._sales_cache = self.load_sales_index()
+        cache = self._sales_cache
+        # Take over the sales checkout appended, unless the cache is behind or past them (then the parse covers them)
+        pending = self._pending_sales
+        while pending:
+            start, end, sale = pending.popleft()
+            if cache['last_offset'] == start:
+                cache['sales'].append(sale)
+                cache['last_offset'] = end
+        path = CONFIG['sales_file']
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        last_offset = cache['last_offset']
+        signature = cache.get('signature')  # None when the cached sales were only ever appended by this app
+        if last_offset and (size < last_offset or not signature or
+                            sales_log_signature(path, signature[1]) != signature):
+            # The log was truncated or replaced: start over
+            cache.update(last_offset=0, sales=[], signature=None)
+        if size == cache['last_offset']:
+            return cache['sales']
+        new_sales, offset = parse_sales_log(path, cache['last_offset'])
+        if offset != cache['last_offset']:
+            cache['sales'].extend(new_sales)
+            cache['last_offset'] = offset
+            cache['signature'] = sales_log_signature(path, min(offset, SALES_SIGNATURE_BYTES))
+            # Write a temp file and swap it in, so a crash mid-write cannot leave a corrupt index
+            index_file = CONFIG['sales_index_file']
+            try:
+                with open(index_file + '.tmp', 'wb') as f:
+                    f.write(json_dumps(cache))
+                os.replace(index_file + '.tmp', index_file)
+            except OSError:
+                pass  # The sidecar is only a cache; the next start reparses what is missing
+        return cache['sales']
 
     def create_widgets(self, parent):
         """Create the main layout and widgets of the application."""
@@ -185,7 +648,7 @@ class POSApp:
         # Header with Manage Products button
         products_header = ttk.Frame(products_container, padding=10, style='Card.TFrame')
         products_header.grid(row=0, column=0, sticky='ew')
-        ttk.Label(products_header, text="Available Products", font=('Segoe UI', 14, 'bold')).pack(side=tk.LEFT)
+        ttk.Label(products_header, text="Available Products", font=self.fonts['heading']).pack(side=tk.LEFT)
         manage_btn = ttk.Button(products_header, text="Manage Products", command=self.manage_products)
         manage_btn.pack(side=tk.RIGHT)
 
@@ -202,7 +665,7 @@ class POSApp:
 
         cart_header = ttk.Frame(cart_container, padding=10, style='Card.TFrame')
         cart_header.grid(row=0, column=0, columnspan=2, sticky='ew')
-        ttk.Label(cart_header, text="Current Order", font=('Segoe UI', 14, 'bold')).pack(side=tk.LEFT)
+        ttk.Label(cart_header, text="Current Order", font=self.fonts['heading']).pack(side=tk.LEFT)
 
         # Cart items display
         cart_cols = ('name', 'qty', 'price')
@@ -228,12 +691,12 @@ class POSApp:
         self.tax_var = tk.StringVar(value="$0.00")
         self.total_var = tk.StringVar(value="$0.00")
         
-        ttk.Label(totals_frame, text="Subtotal:", font=('Segoe UI', 11, 'bold')).grid(row=0, column=0, sticky='w')
-        ttk.Label(totals_frame, textvariable=self.subtotal_var, font=('Segoe UI', 11)).grid(row=0, column=1, sticky='e')
-        ttk.Label(totals_frame, text="Tax:", font=('Segoe UI', 11, 'bold')).grid(row=1, column=0, sticky='w')
-        ttk.Label(totals_frame, textvariable=self.tax_var, font=('Segoe UI', 11)).grid(row=1, column=1, sticky='e')
-        ttk.Label(totals_frame, text="Total:", font=('Segoe UI', 14, 'bold')).grid(row=2, column=0, sticky='w', pady=(10,0))
-        ttk.Label(totals_frame, textvariable=self.total_var, font=('Segoe UI', 14, 'bold')).grid(row=2, column=1, sticky='e', pady=(10,0))
+        ttk.Label(totals_frame, text="Subtotal:", font=self.fonts['label_bold']).grid(row=0, column=0, sticky='w')
+        ttk.Label(totals_frame, textvariable=self.subtotal_var, font=self.fonts['label']).grid(row=0, column=1, sticky='e')
+        ttk.Label(totals_frame, text="Tax:", font=self.fonts['label_bold']).grid(row=1, column=0, sticky='w')
+        ttk.Label(totals_frame, textvariable=self.tax_var, font=self.fonts['label']).grid(row=1, column=1, sticky='e')
+        ttk.Label(totals_frame, text="Total:", font=self.fonts['heading']).grid(row=2, column=0, sticky='w', pady=(10,0))
+        ttk.Label(totals_frame, textvariable=self.total_var, font=self.fonts['heading']).grid(row=2, column=1, sticky='e', pady=(10,0))
 
         # Checkout button
         checkout_btn = ttk.Button(cart_container, text="Proceed to Checkout", command=self.checkout, style='Success.TButton')
@@ -245,76 +708,115 @@ class POSApp:
         - Show total sales, number of transactions, and a sales-over-time chart.
         - Show a clickable log of all sales (Treeview).
         - Clicking a sale shows the full receipt in a popup.
+        The sales log is parsed on a worker thread; the widgets and chart are built in _render_summary.
         """
-        import re
-        from tkinter import ttk
-        sales_file = CONFIG['sales_file']
-        sales = []
-        # --- Parse sales.txt for all sales ---
-        if os.path.exists(sales_file):
-            with open(sales_file, 'r') as f:
-                sale = {}
-                items = []
-                for line in f:
-                    if line.startswith('--- SALE START ---'):
-                        sale = {}
-                        items = []
-                    elif line.startswith('ID: '):
-                        sale['sale_id'] = line.split(': ',1)[1].strip()
-                    elif line.startswith('TIMESTAMP: '):
-                        sale['timestamp'] = line.split(': ',1)[1].strip()
-                    elif line.startswith('ITEM: '):
-                        # Parse item line: id|name|qty|price|type|unit (type/unit optional)
-                        parts = line.split(': ',1)[1].strip().split('|')
-                        item = {
-                            'id': parts[0] if len(parts) > 0 else '',
-                            'name': parts[1] if len(parts) > 1 else '',
-                            'quantity': int(parts[2]) if len(parts) > 2 else 0,
-                            'price': float(parts[3]) if len(parts) > 3 else 0.0,
-                            'type': parts[4] if len(parts) > 4 else 'product',
-                            'unit': parts[5] if len(parts) > 5 else '',
-                        }
-                        items.append(item)
-                    elif line.startswith('SUBTOTAL: '):
-                        sale['subtotal'] = float(line.split(': ',1)[1].strip())
-                    elif line.startswith('TOTAL: '):
-                        sale['total'] = float(line.split(': ',1)[1].strip())
-                    elif line.startswith('TENDERED: '):
-                        sale['cash_tendered'] = float(line.split(': ',1)[1].strip())
-                    elif line.startswith('--- SALE END ---'):
-                        if sale:
-                            sale['items'] = items.copy()
-                            # Calculate tax if possible
-                            if 'total' in sale and 'subtotal' in sale:
-                                sale['tax'] = sale['total'] - sale['subtotal']
-                            else:
-                                sale['tax'] = 0.0
-                            sales.append(sale)
+        self._summary_loading = True
+        placeholder = ttk.Label(parent, text="Loading sales...")
+        placeholder.pack(pady=20)
+        future = self._io_pool.submit(self._summary_data)
+        future.add_done_callback(lambda f: self.root.after(0, self._render_summary, parent, placeholder, f))
+
+    def _summary_data(self):
+        """Worker-side part of the summary: snapshot the sales and build the chart arrays. No Tk or matplotlib calls."""
+        import numpy as np
+        sales = list(self.get_sales())
+        if not sales:
+            return sales, None, None
+        days, totals = daily_totals(sales)
+        dates = days.astype('datetime64[D]')
+        if len(days) > CHART_MAX_POINTS:
+            dates, totals = minmax_downsample(dates, totals, CHART_BUCKETS)
+        return sales, dates, totals
+
+    def _render_summary(self, parent, placeholder, future):
+        """Build the Sales Summary widgets and chart on the Tk thread once _summary_data has finished."""
+        self._summary_loading = False
+        placeholder.destroy()
+        try:
+            sales, dates, totals = future.result()
+        except Exception as e:
+            self._summary_stamp = None  # Retry on the next visit
+            ttk.Label(parent, text=f"Could not load sales: {e}").pack(pady=20)
+            return
+        self._build_summary(parent, sales, dates, totals)
+
+    def _update_summary(self, future):
+        """Bring an already built Sales Summary up to date: new stats, chart data, and log rows only."""
+        self._summary_loading = False
+        try:
+            sales, dates, totals = future.result()
+        except Exception as e:
+            self._summary_stamp = None  # Retry on the next visit
+            messagebox.showerror("Sales Summary", f"Could not load sales: {e}")
+            return
+        shown = self._summary_sales
+        # Rows can only be appended while the log has grown: if sales.txt shrank or was replaced,
+        # the shown rows no longer line up with the sales (and an empty log has no chart data)
+        replaced = dates is None or len(sales) < len(shown) or (
+            shown and sales[len(shown) - 1].get('sale_id') != shown[-1].get('sale_id'))
+        if self._summary_canvas is None or replaced:
+            # Nothing to update in place (the tab showed "no sales" or an error, or the log changed): build it from scratch
+            for child in self.summary_frame.winfo_children():
+                child.destroy()
+            self._summary_canvas = None
+            self._build_summary(self.summary_frame, sales, dates, totals)
+            return
+        shown = len(shown)
+        self._summary_sales = sales
+        self._set_summary_stats(sales)
+        self._summary_line.set_data(dates, totals)
+        self._summary_ax.relim()
+        self._summary_ax.autoscale_view()
+        self._summary_canvas.draw_idle()
+        self._insert_summary_rows(sales[shown:])
+
+    def _set_summary_stats(self, sales):
+        total_sales = math.fsum(s.get('total', 0.0) for s in sales)
+        self._summary_total_label.config(text=f"Total Sales: {CURRENCY}{total_sales:.2f}")
+        self._summary_count_label.config(text=f"Number of Transactions: {len(sales)}")
+
+    def _insert_summary_rows(self, sales):
+        insert_rows(self._summary_tree, ((
+            sale.get('sale_id', '')[:8],
+            sale.get('timestamp', '')[:19],
+            f"{CURRENCY}{sale.get('total', 0.0):.2f}",
+            len(sale.get('items', []))
+        ) for sale in sales))
+
+    def _build_summary(self, parent, sales, dates, totals):
+        """Create the Sales Summary widgets, chart, and log for the given sales."""
+        # matplotlib is imported here rather than at startup since it is by far the slowest import
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+        self._summary_sales = sales
         # --- Stats ---
-        total_sales = sum(s['total'] for s in sales)
-        num_sales = len(sales)
-        ttk.Label(parent, text=f"Total Sales: {CONFIG['currency_symbol']}{total_sales:.2f}", font=('Segoe UI', 14, 'bold')).pack(pady=10)
-        ttk.Label(parent, text=f"Number of Transactions: {num_sales}", font=('Segoe UI', 12)).pack(pady=5)
+        self._summary_total_label = ttk.Label(parent, font=self.fonts['heading'])
+        self._summary_total_label.pack(pady=10)
+        self._summary_count_label = ttk.Label(parent, font=self.fonts['large'])
+        self._summary_count_label.pack(pady=5)
+        self._set_summary_stats(sales)
         # --- Chart ---
         if sales:
-            dates = [datetime.datetime.fromisoformat(s['timestamp']) for s in sales]
-            totals = [s['total'] for s in sales]
-            fig, ax = plt.subplots(figsize=(7,4))
-            ax.plot(dates, totals, marker='o')
+            # A bare Figure rather than pyplot: the canvas owns it, and pyplot's global figure registry is never involved
+            fig = Figure(figsize=(7,4))
+            ax = fig.add_subplot()
+            self._summary_fig, self._summary_ax = fig, ax
+            self._summary_line, = ax.plot(dates, totals, marker='o')
             ax.set_title('Sales Over Time')
             ax.set_xlabel('Date')
-            ax.set_ylabel('Total Sale')
+            ax.set_ylabel('Total Sales per Day')
             fig.autofmt_xdate()
             canvas = FigureCanvasTkAgg(fig, parent)
             canvas.draw()
             canvas.get_tk_widget().pack(pady=10, fill=tk.BOTH, expand=True)
+            self._summary_canvas = canvas
         else:
             ttk.Label(parent, text="No sales data available.").pack(pady=20)
             return
         # --- Sales Log (Treeview) ---
         log_frame = ttk.Frame(parent)
         log_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=10)
-        ttk.Label(log_frame, text="Sales Log (click to view receipt)", font=('Segoe UI', 12, 'bold')).pack(anchor='w')
+        ttk.Label(log_frame, text="Sales Log (click to view receipt)", font=self.fonts['section']).pack(anchor='w')
         columns = ("sale_id", "timestamp", "total", "num_items")
         tree = ttk.Treeview(log_frame, columns=columns, show='headings', height=8)
         tree.heading("sale_id", text="Sale ID")
@@ -326,13 +828,8 @@ class POSApp:
         tree.column("total", width=80, anchor='e')
         tree.column("num_items", width=80, anchor='center')
         # Insert sales into the log
-        for sale in sales:
-            tree.insert('', 'end', values=(
-                sale.get('sale_id', '')[:8],
-                sale.get('timestamp', '')[:19],
-                f"{CONFIG['currency_symbol']}{sale.get('total', 0.0):.2f}",
-                len(sale.get('items', []))
-            ))
+        self._summary_tree = tree
+        self._insert_summary_rows(sales)
         tree.pack(fill=tk.BOTH, expand=True, pady=5)
         # --- Click handler to show receipt ---
         def on_log_click(event):
@@ -340,6 +837,7 @@ class POSApp:
             if not selected:
                 return
             idx = tree.index(selected)
+            sales = self._summary_sales
             if 0 <= idx < len(sales):
                 sale = sales[idx]
                 # Build sale_record for ReceiptWindow
@@ -355,109 +853,92 @@ class POSApp:
                 ReceiptWindow(self.root, sale_record)
         tree.bind('<Double-1>', on_log_click)
         # Add a note for the user
-        ttk.Label(log_frame, text="Double-click a row to view the full receipt.", font=('Segoe UI', 9, 'italic')).pack(anchor='w', pady=(2,0))
+        ttk.Label(log_frame, text="Double-click a row to view the full receipt.", font=self.fonts['italic']).pack(anchor='w', pady=(2,0))
         # Add Export to CSV button
         def export_sales_log():
             file_path = filedialog.asksaveasfilename(title="Export Sales Log", defaultextension=".csv", filetypes=[("CSV Files", "*.csv")])
             if not file_path:
                 return
-            import csv
+            rows = [(
+                sale.get('sale_id', '')[:8],
+                sale.get('timestamp', '')[:19],
+                f"{CURRENCY}{sale.get('total', 0.0):.2f}",
+                len(sale.get('items', []))
+            ) for sale in self._summary_sales]
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(["Sale ID", "Timestamp", "Total", "# Items"])
-                for sale in sales:
-                    writer.writerow([
-                        sale.get('sale_id', '')[:8],
-                        sale.get('timestamp', '')[:19],
-                        f"{CONFIG['currency_symbol']}{sale.get('total', 0.0):.2f}",
-                        len(sale.get('items', []))
-                    ])
+                # Plain joins are much faster than csv.writer; it is only needed when a field has to be quoted
+                if any(CSV_SPECIAL.search(f"{sale_id}{timestamp}{total}") for sale_id, timestamp, total, _ in rows):
+                    writer = csv.writer(f)
+                    writer.writerow(["Sale ID", "Timestamp", "Total", "# Items"])
+                    writer.writerows(rows)
+                else:
+                    lines = ["Sale ID,Timestamp,Total,# Items"]
+                    lines.extend(f"{sale_id},{timestamp},{total},{count}" for sale_id, timestamp, total, count in rows)
+                    lines.append('')
+                    f.write('\r\n'.join(lines))
             messagebox.showinfo("Export Complete", f"Sales log exported to {os.path.basename(file_path)}")
         export_btn = ttk.Button(log_frame, text="Export Sales Log to CSV", command=export_sales_log)
         export_btn.pack(anchor='e', pady=(5,0))
 
     def create_analytics_tab(self, parent):
-        """Create the analytics tab: top-selling products, sales by category, and sales by time period."""
-        sales_file = CONFIG['sales_file']
-        sales = []
-        if os.path.exists(sales_file):
-            with open(sales_file, 'r') as f:
-                sale = {}
-                items = []
-                for line in f:
-                    if line.startswith('--- SALE START ---'):
-                        sale = {}
-                        items = []
-                    elif line.startswith('ID: '):
-                        sale['sale_id'] = line.split(': ',1)[1].strip()
-                    elif line.startswith('TIMESTAMP: '):
-                        sale['timestamp'] = line.split(': ',1)[1].strip()
-                    elif line.startswith('ITEM: '):
-                        parts = line.split(': ',1)[1].strip().split('|')
-                        item = {
-                            'id': parts[0] if len(parts) > 0 else '',
-                            'name': parts[1] if len(parts) > 1 else '',
-                            'quantity': int(parts[2]) if len(parts) > 2 else 0,
-                            'price': float(parts[3]) if len(parts) > 3 else 0.0,
-                            'type': parts[4] if len(parts) > 4 else 'product',
-                            'unit': parts[5] if len(parts) > 5 else '',
-                        }
-                        items.append(item)
-                    elif line.startswith('--- SALE END ---'):
-                        if sale:
-                            sale['items'] = items.copy()
-                            sales.append(sale)
+        """Create the analytics tab: top-selling products, sales by category, and sales by time period.
+        The sales are aggregated on a worker thread; the tables are built in _render_analytics.
+        """
+        self._analytics_loading = True
+        placeholder = ttk.Label(parent, text="Loading analytics...")
+        placeholder.pack(pady=20)
+        future = self._io_pool.submit(self._analytics_data)
+        future.add_done_callback(lambda f: self.root.after(0, self._render_analytics, parent, f))
+
+    def _analytics_data(self):
+        """Worker-side part of the analytics tab: aggregate the sales. No Tk calls."""
+        return aggregate_sales(list(self.get_sales()))
+
+    def _render_analytics(self, parent, future):
+        """Replace the analytics tab's contents with tables for the aggregated sales."""
+        self._analytics_loading = False
+        for child in parent.winfo_children():
+            child.destroy()  # The placeholder, or the tables from the previous build
+        try:
+            top_products, category_counter, (days, day_totals) = future.result()
+        except Exception as e:
+            self._analytics_stamp = None  # Retry on the next visit
+            ttk.Label(parent, text=f"Could not load sales: {e}").pack(pady=20)
+            return
         # Top-selling products
-        product_counter = collections.Counter()
-        for sale in sales:
-            for item in sale.get('items', []):
-                product_counter[item['name']] += item['quantity']
-        top_products = product_counter.most_common(10)
-        ttk.Label(parent, text="Top-Selling Products", font=('Segoe UI', 12, 'bold')).pack(pady=(10,0))
+        ttk.Label(parent, text="Top-Selling Products", font=self.fonts['section']).pack(pady=(10,0))
         tree1 = ttk.Treeview(parent, columns=("Product", "Quantity"), show='headings', height=6)
         tree1.heading("Product", text="Product")
         tree1.heading("Quantity", text="Quantity Sold")
-        for name, qty in top_products:
-            tree1.insert('', 'end', values=(name, qty))
+        insert_rows(tree1, top_products)
         tree1.pack(fill=tk.X, padx=20, pady=5)
         # Sales by category
-        category_counter = collections.Counter()
-        for sale in sales:
-            for item in sale.get('items', []):
-                category_counter[item.get('type', 'product')] += item['quantity']
-        ttk.Label(parent, text="Sales by Type", font=('Segoe UI', 12, 'bold')).pack(pady=(10,0))
+        ttk.Label(parent, text="Sales by Type", font=self.fonts['section']).pack(pady=(10,0))
         tree2 = ttk.Treeview(parent, columns=("Type", "Quantity"), show='headings', height=6)
         tree2.heading("Type", text="Type")
         tree2.heading("Quantity", text="Quantity Sold")
-        for cat, qty in category_counter.items():
-            tree2.insert('', 'end', values=(cat, qty))
+        insert_rows(tree2, category_counter.items())
         tree2.pack(fill=tk.X, padx=20, pady=5)
         # Sales by time period (day)
-        date_counter = collections.Counter()
-        for sale in sales:
-            date = sale.get('timestamp', '')[:10]
-            total = sale.get('total', 0.0)
-            date_counter[date] += total
-        ttk.Label(parent, text="Sales by Day", font=('Segoe UI', 12, 'bold')).pack(pady=(10,0))
+        ttk.Label(parent, text="Sales by Day", font=self.fonts['section']).pack(pady=(10,0))
         tree3 = ttk.Treeview(parent, columns=("Date", "Total Sales"), show='headings', height=6)
         tree3.heading("Date", text="Date")
         tree3.heading("Total Sales", text="Total Sales")
-        for date, total in sorted(date_counter.items()):
-            tree3.insert('', 'end', values=(date, f"{CONFIG['currency_symbol']}{total:.2f}"))
+        insert_rows(tree3, ((str(day), f"{CURRENCY}{total:.2f}") for day, total in zip(days, day_totals)))
         tree3.pack(fill=tk.X, padx=20, pady=5)
 
     def create_sync_tab(self, parent):
         """Create IMS sync tab for import/export tangible items and show current active products file."""
         frame = ttk.Frame(parent, padding=20)
         frame.pack(fill=tk.BOTH, expand=True)
-        ttk.Label(frame, text="IMS ↔ POS Sync", font=('Segoe UI', 14, 'bold')).pack(pady=10)
+        ttk.Label(frame, text="IMS ↔ POS Sync", font=self.fonts['heading']).pack(pady=10)
         ttk.Button(frame, text="Import Tangible Items from IMS", command=self.import_from_ims).pack(pady=10)
         ttk.Button(frame, text="Export Tangible Items to IMS", command=self.export_to_ims).pack(pady=10)
         self.sync_status = tk.StringVar(value="Ready.")
-        ttk.Label(frame, textvariable=self.sync_status, font=('Segoe UI', 10)).pack(pady=10)
+        ttk.Label(frame, textvariable=self.sync_status, font=self.fonts['body']).pack(pady=10)
         # Show current active products file
         self.active_file_var = tk.StringVar(value=f"Active Products File: {os.path.basename(CONFIG['products_file'])}")
-        self.active_file_label = ttk.Label(frame, textvariable=self.active_file_var, font=('Segoe UI', 9, 'italic'))
+        self.active_file_label = ttk.Label(frame, textvariable=self.active_file_var, font=self.fonts['italic'])
         self.active_file_label.pack(pady=(10,0))
 
     def import_from_ims(self):
@@ -465,10 +946,11 @@ class POSApp:
         file_path = filedialog.askopenfilename(title="Import from IMS", filetypes=[("All Supported", "*.json *.txt *.csv *.yaml *.yml"), ("All Files", "*.*")])
         if not file_path:
             return
-        self.load_data(file_path)
-        self.save_products()  # Save to current file for persistence
-        self.refresh_main_window()
-        self.sync_status.set(f"Imported items from {os.path.basename(file_path)}.")
+        def imported():
+            self.save_products()  # Save to current file for persistence
+            self.sync_status.set(f"Imported items from {os.path.basename(file_path)}.")
+        # Large files load in the background, so persist only once the new catalog is in place
+        self.load_data(file_path, on_loaded=imported)
 
     def export_to_ims(self):
         """Export all items to IMS in any supported format, including all fields."""
@@ -479,158 +961,57 @@ class POSApp:
         self.sync_status.set(f"Exported items to {os.path.basename(file_path)}.")
 
     # --- DATA HANDLING ---
-    def load_data(self, filepath=None):
-        """Load products/items from JSON, TXT, CSV, or YAML. Accepts all item types and field variants."""
-        import csv
+    def load_data(self, filepath=None, on_loaded=None):
+        """Load products/items from JSON, TXT, CSV, or YAML. Accepts all item types and field variants.
+        on_loaded is called after a successful load, which may be after this returns for large files."""
+        path = filepath or CONFIG['products_file']
         try:
-            self.products.clear()
-            path = filepath or CONFIG['products_file']
-            if path.endswith('.json'):
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for item in data:
-                        # Accept both 'id' and 'product_id', and all category fields
-                        prod_id = item.get('id') or item.get('product_id') or f"prod_{uuid.uuid4().hex[:8]}"
-                        name = item.get('name', 'Unknown')
-                        category = item.get('category', '')
-                        category_main = item.get('category_main', category)
-                        category_sub = item.get('category_sub', '')
-                        type_ = item.get('type', 'product')
-                        price = float(item.get('price', 0.0))
-                        stock = int(item.get('stock', 0))
-                        unit = item.get('unit', 'pcs')
-                        description = item.get('description', '')
-                        self.products.append({
-                            'id': prod_id,
-                            'name': name,
-                            'category': category,
-                            'category_main': category_main,
-                            'category_sub': category_sub,
-                            'type': type_,
-                            'price': price,
-                            'stock': stock,
-                            'unit': unit,
-                            'description': description
-                        })
-            elif path.endswith('.csv'):
-                with open(path, 'r', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    for item in reader:
-                        prod_id = item.get('id') or item.get('product_id') or f"prod_{uuid.uuid4().hex[:8]}"
-                        name = item.get('name', 'Unknown')
-                        category = item.get('category', '')
-                        category_main = item.get('category_main', category)
-                        category_sub = item.get('category_sub', '')
-                        type_ = item.get('type', 'product')
-                        price = float(item.get('price', 0.0))
-                        stock = int(item.get('stock', 0))
-                        unit = item.get('unit', 'pcs')
-                        description = item.get('description', '')
-                        self.products.append({
-                            'id': prod_id,
-                            'name': name,
-                            'category': category,
-                            'category_main': category_main,
-                            'category_sub': category_sub,
-                            'type': type_,
-                            'price': price,
-                            'stock': stock,
-                            'unit': unit,
-                            'description': description
-                        })
-            elif path.endswith('.yaml') or path.endswith('.yml'):
-                import yaml
-                with open(path, 'r', encoding='utf-8') as f:
-                    data = yaml.safe_load(f)
-                    for item in data:
-                        prod_id = item.get('id') or item.get('product_id') or f"prod_{uuid.uuid4().hex[:8]}"
-                        name = item.get('name', 'Unknown')
-                        category = item.get('category', '')
-                        category_main = item.get('category_main', category)
-                        category_sub = item.get('category_sub', '')
-                        type_ = item.get('type', 'product')
-                        price = float(item.get('price', 0.0))
-                        stock = int(item.get('stock', 0))
-                        unit = item.get('unit', 'pcs')
-                        description = item.get('description', '')
-                        self.products.append({
-                            'id': prod_id,
-                            'name': name,
-                            'category': category,
-                            'category_main': category_main,
-                            'category_sub': category_sub,
-                            'type': type_,
-                            'price': price,
-                            'stock': stock,
-                            'unit': unit,
-                            'description': description
-                        })
-            else:
-                # TXT fallback: pipe-delimited, legacy and new format
-                with open(path, 'r', encoding='utf-8') as f:
-                    for line in f:
-                        if not line.strip(): continue
-                        parts = line.strip().split('|')
-                        if len(parts) == 4:
-                            prod_id, name, price, stock = parts[:4]
-                            self.products.append({
-                                'id': prod_id,
-                                'name': name,
-                                'category': '',
-                                'category_main': '',
-                                'category_sub': '',
-                                'type': 'product',
-                                'price': float(price),
-                                'stock': int(stock),
-                                'unit': 'pcs',
-                                'description': ''
-                            })
-                        elif len(parts) >= 8:
-                            prod_id, name, category, type_, price, stock, unit, description = parts[:8]
-                            self.products.append({
-                                'id': prod_id,
-                                'name': name,
-                                'category': category,
-                                'category_main': category,
-                                'category_sub': '',
-                                'type': type_,
-                                'price': float(price),
-                                'stock': int(stock),
-                                'unit': unit,
-                                'description': description
-                            })
+            large = os.path.getsize(path) > LARGE_FILE_BYTES
+        except OSError:
+            large = False
+        if large:
+            # Parse on the worker, then swap the catalog in on the Tk thread
+            future = self._io_pool.submit(self._read_products, path)
+            future.add_done_callback(lambda f: self.root.after(0, self._finish_load, path, f.result, on_loaded))
+        else:
+            self._finish_load(path, lambda: self._read_products(path), on_loaded)
+
+    def _read_products(self, path):
+        """Parse a products file into a new list of product dicts. Touches no app or Tk state, so it can run on the pool."""
+        load = PRODUCT_LOADERS.get(os.path.splitext(path)[1], load_txt_items)
+        new_ids = new_product_ids()  # Only drawn from for rows without an id
+        products = [normalize_product(item, new_ids) for item in load(path)]
+        for product in products:
+            cache_display_strings(product)
+        return products
+
+    def _finish_load(self, path, read, on_loaded=None):
+        """Install the products returned by read() as the active catalog and refresh the product display."""
+        try:
+            self.products[:] = read()
             CONFIG['products_file'] = path
             # Update the active file label if it exists
             if hasattr(self, 'active_file_var'):
                 self.active_file_var.set(f"Active Products File: {os.path.basename(CONFIG['products_file'])}")
         except Exception as e:
+            self.products.clear()
             messagebox.showerror("Error Loading Data", f"Could not load products: {e}")
+            on_loaded = None
+        self._reindex_products()
         self.update_product_display()
+        if on_loaded:
+            on_loaded()
 
     def save_products(self, filepath=None):
         """Save the current product list to JSON, TXT, CSV, or YAML, including all fields. Always save to the active file unless a new path is given."""
-        import csv
+        # This save covers any deferred one: cancel a pending start and let a running one finish first,
+        # so the two never write the file at once and an older snapshot cannot land after this one
+        self._products_dirty = False
+        if self._products_save_future is not None:
+            wait([self._products_save_future])  # Its error, if any, is reported by _finish_products_save
         try:
             path = filepath or CONFIG['products_file']
-            if path.endswith('.json'):
-                with open(path, 'w', encoding='utf-8') as f:
-                    json.dump(self.products, f, indent=4)
-            elif path.endswith('.csv'):
-                with open(path, 'w', encoding='utf-8', newline='') as f:
-                    fieldnames = ['id','name','category','category_main','category_sub','type','price','stock','unit','description']
-                    writer = csv.DictWriter(f, fieldnames=fieldnames)
-                    writer.writeheader()
-                    for product in self.products:
-                        writer.writerow(product)
-            elif path.endswith('.yaml') or path.endswith('.yml'):
-                import yaml
-                with open(path, 'w', encoding='utf-8') as f:
-                    yaml.safe_dump(self.products, f, allow_unicode=True)
-            else:
-                with open(path, 'w', encoding='utf-8') as f:
-                    for product in self.products:
-                        line = f"{product['id']}|{product['name']}|{product.get('category','')}|{product.get('type','product')}|{product.get('price',0.0)}|{product.get('stock',0)}|{product.get('unit','pcs')}|{product.get('description','')}\n"
-                        f.write(line)
+            write_products(path, self.products)
             CONFIG['products_file'] = path
             # Update the active file label if it exists
             if hasattr(self, 'active_file_var'):
@@ -640,47 +1021,117 @@ class POSApp:
             messagebox.showerror("Error Saving Data", f"Could not save products: {e}")
             return False
 
+    def save_products_later(self):
+        """Save the products on the worker pool after the current event, coalescing repeated calls.
+
+        Used on the checkout path so the receipt appears without waiting for the file rewrite. Saves
+        run one at a time; changes made while one is running are written by a follow-up save.
+        """
+        if self._products_dirty:
+            return
+        self._products_dirty = True
+        if self._products_save_future is None:
+            self.root.after_idle(self._start_products_save)
+
+    def _start_products_save(self):
+        if not self._products_dirty:
+            return  # A synchronous save_products already wrote these changes
+        self._products_dirty = False
+        # Snapshot on the Tk thread: the worker must not read dicts that checkout keeps changing
+        snapshot = [product.copy() for product in self.products]
+        future = self._io_pool.submit(write_products, CONFIG['products_file'], snapshot)
+        self._products_save_future = future
+        future.add_done_callback(lambda f: self.root.after(0, self._finish_products_save, f))
+
+    def _finish_products_save(self, future):
+        self._products_save_future = None
+        try:
+            future.result()
+        except Exception as e:
+            messagebox.showerror("Error Saving Data", f"Could not save products: {e}")
+        if self._products_dirty:
+            self._start_products_save()
+
+    def _flush_products_save(self):
+        """At exit, write stock changes whose deferred save never got to run."""
+        if self._products_dirty:
+            self._products_dirty = False
+            write_products(CONFIG['products_file'], self.products)
+
+    def _reindex_products(self):
+        """Rebuild the product-id index. Mutates in place so shared references stay valid."""
+        self.products_by_id.clear()
+        self.products_by_id.update((p['id'], p) for p in self.products)
+
     # --- PRODUCT DISPLAY ---
     def update_product_display(self):
-        """Clear and recreate the product buttons. Highlight low stock products."""
-        for button in self.product_buttons:
-            button.destroy()
-        self.product_buttons.clear()
-
-        row, col = 0, 0
-        for product in self.products:
-            # Highlight low stock (threshold = 5)
-            low_stock = product.get('type', 'product') == 'product' and product.get('stock', 0) <= 5
-            btn_bg = COLORS['danger'] if low_stock else COLORS['product_bg']
-            btn_fg = COLORS['white'] if low_stock else COLORS['dark_text']
-            btn = tk.Button(self.products_frame, 
-                            text=f"{product['name']}\n{CONFIG['currency_symbol']}{product['price']:.2f}",
-                            font=('Segoe UI', 10), 
-                            wraplength=120,
-                            justify='center',
-                            bg=btn_bg,
-                            fg=btn_fg,
-                            relief='flat',
-                            activebackground=COLORS['primary'],
-                            activeforeground=COLORS['white'],
-                            command=lambda p=product: self.add_to_cart(p))
-            btn.grid(row=row, column=col, sticky='nsew', padx=5, pady=5, ipadx=10, ipady=10)
-            self.products_frame.grid_columnconfigure(col, weight=1)
-            self.product_buttons.append(btn)
-            col += 1
-            if col > 3:
-                col = 0
-                row += 1
+        """Show the product list on the pooled product buttons. Highlight low stock products.
+
+        Button i always sits in grid cell (i // 4, i % 4), so existing buttons are only
+        reconfigured, and only when their product, label, or low-stock state changed. Buttons are created when the catalog outgrows the pool and
+        hidden (not destroyed) when it shrinks, so they can be reused later.
+        """
+        pool = self._button_pool
+        configure = self.configure_product_button
+        self.product_buttons = buttons = {}
+        for i, product in enumerate(self.products):
+            if i < len(pool):
+                btn = pool[i]
+            else:
+                btn = self._make_product_button(i)
+                pool.append(btn)
+            configure(btn, product)
+            if i >= self._visible_buttons:
+                btn.grid(row=i // 4, column=i % 4, sticky='nsew', padx=5, pady=5, ipadx=10, ipady=10)
+            buttons[product['id']] = btn
+        for btn in pool[len(self.products):self._visible_buttons]:
+            btn.grid_forget()
+        self._visible_buttons = len(self.products)
+
+    def _make_product_button(self, slot):
+        """Create an unconfigured product button for the given pool slot."""
+        if slot < 4:
+            self.products_frame.grid_columnconfigure(slot, weight=1)
+        return tk.Button(self.products_frame,
+                         font=self.fonts['product'],
+                         wraplength=120,
+                         justify='center',
+                         relief='flat',
+                         activebackground=COLORS['primary'],
+                         activeforeground=COLORS['white'])
+
+    def configure_product_button(self, btn, product):
+        """Set a product button's label, low-stock colors, and command. Skipped if nothing shown has changed."""
+        # Highlight low stock (threshold = 5)
+        low_stock = product.get('type', 'product') == 'product' and product.get('stock', 0) <= 5
+        state = self._button_state.get(btn)
+        if state and state[0] is product and state[1] == product['_btn_text'] and state[2] == low_stock:
+            return
+        self._button_state[btn] = (product, product['_btn_text'], low_stock)
+        btn.config(text=product['_btn_text'],
+                   bg=COLORS['danger'] if low_stock else COLORS['product_bg'],
+                   fg=COLORS['white'] if low_stock else COLORS['dark_text'],
+                   command=lambda p=product: self.add_to_cart(p))
     
+    def refresh_product_buttons(self, products):
+        """Reconfigure the buttons currently showing the given products."""
+        buttons = self.product_buttons
+        for product in products:
+            btn = buttons.get(product['id'])
+            if btn:
+                self.configure_product_button(btn, product)
+
     # --- CART LOGIC ---
     def add_to_cart(self, product):
         """Add a product or item to the cart or increment its quantity."""
         # Find product in cart
-        for item in self.cart:
-            if item['id'] == product['id']:
-                item['quantity'] += 1
-                self.update_cart_display()
-                return
+        item = self.cart.get(product['id'])
+        if item:
+            item['quantity'] += 1
+            self._subtotal += item['price']
+            self._stale_cart_rows.add(item['id'])
+            self.schedule_cart_update()
+            return
         # Only check stock for tangible products
         if product.get('type', 'product') == 'product' and product.get('stock', 0) <= 0:
             messagebox.showwarning("Out of Stock", f"'{product['name']}' is out of stock.")
@@ -693,8 +1144,10 @@ class POSApp:
             "price": product['price'],
             "quantity": 1
         }
-        self.cart.append(cart_item)
-        self.update_cart_display()
+        self.cart[product['id']] = cart_item
+        self._subtotal += cart_item['price']
+        self.add_cart_row(cart_item)
+        self.schedule_cart_update()
 
     def remove_from_cart(self):
         """Remove the selected item from the cart."""
@@ -705,34 +1158,79 @@ class POSApp:
         
         for item_id_in_tree in selected_items:
             # The iid of the tree item is the product id
-            self.cart = [item for item in self.cart if item['id'] != item_id_in_tree]
+            item = self.cart.pop(item_id_in_tree, None)
+            if item:
+                self._subtotal -= item['price'] * item['quantity']
+        self.remove_cart_rows(*selected_items)
+        if not self.cart:
+            self._subtotal = 0.0  # Drop any accumulated float drift
 
-        self.update_cart_display()
+        self.schedule_cart_update()
+
+    def _cart_row_values(self, item):
+        """Return the (name, qty, price) values shown for a cart item."""
+        display_name = item['name']
+        type_ = item.get('type', 'product')
+        if type_ != 'product':
+            display_name += f" ({type_})"
+        elif item.get('unit'):
+            display_name += f" [{item['unit']}]"
+        quantity = item['quantity']
+        return (display_name, quantity, f"{CURRENCY}{item['price'] * quantity:.2f}")
+
+    def add_cart_row(self, item):
+        """Append a row for a new cart item."""
+        self.cart_tree.insert('', 'end', iid=item['id'], values=self._cart_row_values(item))
+
+    def update_cart_row(self, item):
+        """Refresh the quantity and line total of an existing cart row."""
+        self.cart_tree.item(item['id'], values=self._cart_row_values(item))
+
+    def remove_cart_rows(self, *iids):
+        """Delete the given cart rows in a single Treeview call."""
+        self.cart_tree.delete(*iids)
 
     def update_cart_display(self):
         """Clear and repopulate the cart display and update totals."""
-        # Clear tree
-        for i in self.cart_tree.get_children():
-            self.cart_tree.delete(i)
-        # Repopulate tree
-        for item in self.cart:
-            display_name = item['name']
-            if item.get('type', 'product') != 'product':
-                display_name += f" ({item['type']})"
-            if item.get('unit') and item.get('type', 'product') == 'product':
-                display_name += f" [{item['unit']}]"
-            self.cart_tree.insert('', 'end', iid=item['id'], values=(display_name, item['quantity'], f"{CONFIG['currency_symbol']}{item['price'] * item['quantity']:.2f}"))
+        # Clear tree in one Treeview call
+        children = self.cart_tree.get_children()
+        if children:
+            self.remove_cart_rows(*children)
+        # Repopulate tree, collecting line totals in the same pass
+        add_row = self.add_cart_row
+        line_totals = []
+        for item in self.cart.values():
+            add_row(item)
+            line_totals.append(item['price'] * item['quantity'])
+        # fsum is exact, so this also clears any drift in the running subtotal
+        self._subtotal = math.fsum(line_totals)
+        self.update_totals()
+
+    def schedule_cart_update(self):
+        """Redraw changed cart rows and the totals on the next frame, so a burst of scans costs one redraw."""
+        if self._cart_update_job is None:
+            self._cart_update_job = self.root.after(16, self._flush_cart_update)
+
+    def _flush_cart_update(self):
+        self._cart_update_job = None
+        cart = self.cart
+        for item_id in self._stale_cart_rows:
+            item = cart.get(item_id)
+            if item:
+                self.update_cart_row(item)
+        self._stale_cart_rows.clear()
         self.update_totals()
 
     def update_totals(self):
-        """Calculate and display the subtotal, tax, and total."""
-        subtotal = sum(item['price'] * item['quantity'] for item in self.cart)
-        tax = subtotal * CONFIG['tax_rate']
+        """Display the subtotal, tax, and total from the running subtotal."""
+        sym = CURRENCY
+        subtotal = self._subtotal
+        tax = subtotal * TAX_RATE
         total = subtotal + tax
         
-        self.subtotal_var.set(f"{CONFIG['currency_symbol']}{subtotal:.2f}")
-        self.tax_var.set(f"{CONFIG['currency_symbol']}{tax:.2f}")
-        self.total_var.set(f"{CONFIG['currency_symbol']}{total:.2f}")
+        self.subtotal_var.set(f"{sym}{subtotal:.2f}")
+        self.tax_var.set(f"{sym}{tax:.2f}")
+        self.total_var.set(f"{sym}{total:.2f}")
 
     # --- CHECKOUT PROCESS ---
     def checkout(self):
@@ -741,60 +1239,88 @@ class POSApp:
             messagebox.showwarning("Empty Cart", "Cannot checkout with an empty cart.")
             return
 
-        total_amount = sum(item['price'] * item['quantity'] for item in self.cart) * (1 + CONFIG['tax_rate'])
+        total_amount = self._subtotal * (1 + TAX_RATE)
         
         # Open payment dialog
-        PaymentDialog(self.root, total_amount, self.finalize_sale)
+        PaymentDialog(self.root, total_amount, self.finalize_sale, self.fonts)
         
     def finalize_sale(self, total, tendered):
         """Finalize the sale, save data, and show receipt. Also sync IMS stock for tangible items (stub)."""
+        items = list(self.cart.values())
         # 1. Update stock quantities (only for tangible products)
-        for cart_item in self.cart:
-            for product in self.products:
-                if product['id'] == cart_item['id'] and product.get('type', 'product') == 'product':
-                    product['stock'] -= cart_item['quantity']
-                    # --- IMS SYNC HOOK: update IMS stock here (API/file integration) ---
-                    # Example: self.sync_ims_stock(product['id'], product['stock'])
-                    break
+        sold = []
+        for cart_item in items:
+            product = self.products_by_id.get(cart_item['id'])
+            if product and product.get('type', 'product') == 'product':
+                product['stock'] -= cart_item['quantity']
+                sold.append(product)
+                # --- IMS SYNC HOOK: update IMS stock here (API/file integration) ---
+                # Example: self.sync_ims_stock(product['id'], product['stock'])
         # 2. Record the sale to sales.txt
-        sale_id = str(uuid.uuid4())
-        timestamp = datetime.datetime.now().isoformat()
-        subtotal = sum(item['price'] * item['quantity'] for item in self.cart)
+        sale_id = secrets.token_hex(8)
+        now = datetime.datetime.now()
+        timestamp = now.isoformat()
+        subtotal = self._subtotal
+        # Format the whole record first so it is appended with a single write
+        item_fmt = SALE_ITEM_FMT.format
+        record = SALE_FMT.format(
+            sale_id=sale_id, timestamp=timestamp, subtotal=subtotal, total=total, tendered=tendered,
+            items=''.join(item_fmt(id=item['id'], name=item['name'], quantity=item['quantity'], price=item['price'],
+                                   type=item.get('type', 'product'), unit=item.get('unit', ''))
+                          for item in items))
+        # The same sale as parse_sales_log would read it back, so the sales cache can skip re-parsing it
+        logged_sale = {
+            'sale_id': sale_id, 'timestamp': timestamp,
+            'subtotal': round(subtotal, 2), 'total': round(total, 2), 'cash_tendered': round(tendered, 2),
+            'items': [{'id': item['id'], 'name': item['name'], 'quantity': item['quantity'], 'price': item['price'],
+                       'type': item.get('type', 'product'), 'unit': item.get('unit', '')} for item in items],
+        }
+        logged_sale['tax'] = logged_sale['total'] - logged_sale['subtotal']
         try:
-            with open(CONFIG['sales_file'], 'a') as f:
-                f.write(f"--- SALE START ---\n")
-                f.write(f"ID: {sale_id}\n")
-                f.write(f"TIMESTAMP: {timestamp}\n")
-                for item in self.cart:
-                    f.write(f"ITEM: {item['id']}|{item['name']}|{item['quantity']}|{item['price']}|{item.get('type','product')}|{item.get('unit','')}\n")
-                f.write(f"SUBTOTAL: {subtotal:.2f}\n")
-                f.write(f"TOTAL: {total:.2f}\n")
-                f.write(f"TENDERED: {tendered:.2f}\n")
-                f.write(f"--- SALE END ---\n\n")
+            self.append_sales_log(record, logged_sale)
         except Exception as e:
             messagebox.showerror("Sale Log Error", f"Could not write to sales file: {e}")
-        # 3. Save updated product stock
-        self.save_products()
+        # 3. Save updated product stock once the receipt is up, on the worker pool
+        self.save_products_later()
         # Create sale_record for receipt window
         sale_record = {
-            "sale_id": sale_id, "timestamp": timestamp, "items": self.cart,
+            "sale_id": sale_id, "timestamp": timestamp, "_timestamp_dt": now, "items": items,
             "subtotal": subtotal, "tax": total - subtotal, "total": total,
             "cash_tendered": tendered
         }
         # 4. Show receipt
         ReceiptWindow(self.root, sale_record)
         # 5. Reset for next sale
-        self.cart = []
+        self.cart = {}
         self.update_cart_display()
-        self.update_product_display()
+        # Stock may now be low; recolor the sold products' buttons once the receipt has painted
+        self.root.after_idle(self.refresh_product_buttons, sold)
+
+    def append_sales_log(self, text, sale=None):
+        """Append a formatted sale block through the persistent sales log handle and flush it to disk.
+
+        If the parsed form of the block is given, it is queued for the sales cache, which takes it
+        over without parsing if the cache is up to date with the log. Queuing instead of taking
+        _sales_lock keeps checkout from waiting on a parse running on the pool.
+        """
+        data = text.encode('utf-8')
+        with self._sales_write_lock:
+            if self._sales_fh is None or self._sales_fh.closed:
+                self._sales_fh = open(CONFIG['sales_file'], 'ab', buffering=64 * 1024)
+                atexit.register(self._sales_fh.close)
+            start = self._sales_fh.tell()
+            self._sales_fh.write(data)
+            self._sales_fh.flush()  # get_sales and other readers see the block immediately
+        if sale is not None:
+            self._pending_sales.append((start, start + len(data), sale))
 
     # --- PRODUCT MANAGEMENT ---
     def manage_products(self):
-        ProductManager(self.root, self.products, self.refresh_main_window, self.save_products)
+        ProductManager(self.root, self, self.refresh_main_window)
 
     def refresh_main_window(self):
         """Callback to refresh the main window after product changes."""
-        self.load_data() # Reload from file to ensure consistency
+        # ProductManager edits self.products in place and has already saved it, so no reload is needed
         self.update_product_display()
 
     # --- IMS SYNC STUB (for future API/file integration) ---
@@ -806,16 +1332,17 @@ class POSApp:
 # --- HELPER DIALOGS & WINDOWS ---
 class ProductManager(tk.Toplevel):
     """A Toplevel window for managing the product list with multi-select checkboxes."""
-    def __init__(self, parent, products, refresh_callback, save_callback):
+    def __init__(self, parent, app, refresh_callback):
         super().__init__(parent)
         self.title("Product Management")
         self.geometry("1000x600")
         self.transient(parent)
         self.grab_set()
-        self.products = products
+        self.app = app  # Owns the product list and id index; both are kept in sync on every mutation
         self.refresh_callback = refresh_callback
-        self.save_callback = save_callback
         self.checked_ids = set()  # Track checked product IDs
+        self._shown_ids = set()  # Product ids that have a row
+        self._fill_job = None  # Pending after_idle that inserts the next batch of rows
         self.create_prod_widgets()
 
     def create_prod_widgets(self):
@@ -834,10 +1361,13 @@ class ProductManager(tk.Toplevel):
         cols = ('checked', 'id', 'name', 'category', 'type', 'price', 'stock', 'unit', 'description')
         self.prod_tree = ttk.Treeview(self, columns=cols, show='headings')
         self._sort_orders = {col: False for col in cols if col != 'checked'}
+        self._sort_cache = {}  # column -> row iids in ascending order; cleared whenever rows change
         self.prod_tree.heading('checked', text='', anchor='center')
         self.prod_tree.column('checked', width=32, anchor='center')
         for col, label in zip(cols[1:], ["ID", "Name", "Category", "Type", "Price", "Stock", "Unit", "Description"]):
             self.prod_tree.heading(col, text=label, command=lambda c=col: self.sort_by_column(c))
+        # Rows get their tags at insert time; the tag style itself only needs configuring once
+        self.prod_tree.tag_configure('low_stock', background='#ffe5e5')  # Light red
         self.prod_tree.pack(fill='both', expand=True, padx=10, pady=10)
         self.prod_tree.bind('<Button-1>', self.on_treeview_click)
         self.refresh_prod_list()
@@ -849,89 +1379,173 @@ class ProductManager(tk.Toplevel):
         if region == 'cell' and col == '#1':
             row_id = self.prod_tree.identify_row(event.y)
             if row_id:
-                prod_id = self.prod_tree.set(row_id, 'id')
-                if prod_id in self.checked_ids:
-                    self.checked_ids.remove(prod_id)
+                # Row iids are product ids; only the clicked checkbox cell changes
+                if row_id in self.checked_ids:
+                    self.checked_ids.remove(row_id)
+                    self.prod_tree.set(row_id, 'checked', '☐')
                 else:
-                    self.checked_ids.add(prod_id)
-                self.refresh_prod_list()
+                    self.checked_ids.add(row_id)
+                    self.prod_tree.set(row_id, 'checked', '☑')
         # Allow normal selection for other columns
 
+    def sort_by_column(self, col):
+        """Sort the rows by a column, toggling the direction on each click.
+
+        Keys come straight from the product dicts (row iids are product ids), so no cell
+        is read back from Tk: price and stock sort by value, other columns
+        case-insensitively. The ascending order is cached per column until the rows
+        change, so repeat clicks only reverse it.
+        """
+        tree = self.prod_tree
+        order = self._sort_cache.get(col)
+        if order is None:
+            by_id = self.app.products_by_id
+            numeric = col in ('price', 'stock')
+            hidden = col in ('stock', 'unit')  # Shown blank for non-product items
+            def key(iid):
+                p = by_id[iid]
+                if hidden and p.get('type', 'product') != 'product':
+                    return float('-inf') if numeric else ''
+                value = p.get(col, '')
+                return float(value or 0) if numeric else str(value).lower()
+            order = self._sort_cache[col] = sorted(tree.get_children(''), key=key)
+        reverse = self._sort_orders[col]
+        move = tree.move
+        for index, iid in enumerate(reversed(order) if reverse else order):
+            move(iid, '', index)
+        self._sort_orders[col] = not reverse
+
     def toggle_select_all(self):
         if self.select_all_var.get():
-            self.checked_ids = set(p.get('id', '') for p in self.products)
+            self.checked_ids = set(p.get('id', '') for p in self.app.products)
+            mark = '☑'
         else:
             self.checked_ids.clear()
-        self.refresh_prod_list()
+            mark = '☐'
+        # Update the checkbox cells in place; rows still waiting to be filled read checked_ids when inserted
+        tree = self.prod_tree
+        for iid in tree.get_children():
+            tree.set(iid, 'checked', mark)
 
     def refresh_prod_list(self):
-        for i in self.prod_tree.get_children():
-            self.prod_tree.delete(i)
-        for p in self.products:
-            prod_id = p.get('id', '')
-            checked = '☑' if prod_id in self.checked_ids else '☐'
-            values = (
-                checked,
-                prod_id,
-                p.get('name', ''),
-                p.get('category', ''),
-                p.get('type', 'product'),
-                f"{p.get('price', 0.0):.2f}",
-                p.get('stock', 0) if p.get('type', 'product') == 'product' else '',
-                p.get('unit', '') if p.get('type', 'product') == 'product' else '',
-                p.get('description', '')
-            )
-            item_id = self.prod_tree.insert('', 'end', values=values)
-            # Highlight low stock rows
-            if p.get('type', 'product') == 'product' and p.get('stock', 0) <= 5:
-                self.prod_tree.item(item_id, tags=('low_stock',))
-        self.prod_tree.tag_configure('low_stock', background='#ffe5e5')  # Light red
+        tree = self.prod_tree
+        self._sort_cache.clear()
+        if self._fill_job:
+            self.after_cancel(self._fill_job)
+            self._fill_job = None
+        children = tree.get_children()
+        if children:
+            tree.delete(*children)  # One Tcl call for all rows
+        self._shown_ids = set()
+        self._fill_rows(list(self.app.products), 0)
+
+    def _fill_rows(self, products, start):
+        """Insert one batch of rows from a product snapshot and schedule the next, so a large catalog opens at once."""
+        self._fill_job = None
+        if not self.winfo_exists():
+            return
+        insert = self.prod_tree.insert
+        prod_row = self.prod_row
+        shown = self._shown_ids
+        by_id = self.app.products_by_id
+        self._sort_cache.clear()
+        end = start + PRODUCT_ROWS_PER_BATCH
+        for p in products[start:end]:
+            prod_id = p['id']
+            # Row iids are product ids, so show a duplicated id once. Rows added while
+            # filling are already shown; products deleted while filling are skipped.
+            if prod_id not in shown and prod_id in by_id:
+                shown.add(prod_id)
+                values, tags = prod_row(p)
+                insert('', 'end', iid=prod_id, values=values, tags=tags)
+        if end < len(products):
+            self._fill_job = self.after_idle(self._fill_rows, products, end)
+
+    def prod_row(self, p):
+        """Return the (values, tags) of the Treeview row for a product."""
+        prod_id = p.get('id', '')
+        type_ = p.get('type', 'product')
+        is_product = type_ == 'product'
+        stock = p.get('stock', 0)
+        values = (
+            '☑' if prod_id in self.checked_ids else '☐',
+            prod_id,
+            p.get('name', ''),
+            p.get('category', ''),
+            type_,
+            p['_price_str'],
+            stock if is_product else '',
+            p.get('unit', '') if is_product else '',
+            p.get('description', '')
+        )
+        # Highlight low stock rows
+        return values, ('low_stock',) if is_product and stock <= 5 else ()
+
+    def insert_prod_row(self, p, index='end'):
+        """Insert a single product row, using the product id as the row iid."""
+        values, tags = self.prod_row(p)
+        self._sort_cache.clear()
+        self._shown_ids.add(p['id'])
+        self.prod_tree.insert('', index, iid=p['id'], values=values, tags=tags)
 
     def delete_checked_products(self):
         if not self.checked_ids:
             messagebox.showwarning("No Selection", "Please check at least one item to delete.")
             return
         if messagebox.askyesno("Confirm Delete", f"Are you sure you want to delete {len(self.checked_ids)} checked item(s)?"):
-            self.products[:] = [p for p in self.products if p.get('id', '') not in self.checked_ids]
+            self.app.products[:] = [p for p in self.app.products if p.get('id', '') not in self.checked_ids]
+            self._sort_cache.clear()
+            for prod_id in self.checked_ids:
+                if self.app.products_by_id.pop(prod_id, None) is not None and prod_id in self._shown_ids:
+                    self._shown_ids.discard(prod_id)  # Rows not inserted yet are skipped by _fill_rows
+                    self.prod_tree.delete(prod_id)
             self.checked_ids.clear()
             self.select_all_var.set(False)
-            self.refresh_prod_list()
 
     def add_product(self):
         EditProductDialog(self, None, self.add_product_callback, categories=CATEGORIES)
 
     def add_product_callback(self, _, new_data):
-        self.products.append(new_data)
-        self.refresh_prod_list()
+        cache_display_strings(new_data)
+        self.app.products.append(new_data)
+        if new_data['id'] in self.app.products_by_id:
+            self.app.products_by_id[new_data['id']] = new_data
+            self.refresh_prod_list()  # Duplicate id: let the full refresh decide which row shows
+            return
+        self.app.products_by_id[new_data['id']] = new_data
+        self.insert_prod_row(new_data)
 
     def edit_product(self):
         selected = self.prod_tree.selection()
         if not selected:
             messagebox.showwarning("No Selection", "Please select an item to edit.")
             return
-        item_id = selected[0]
-        values = self.prod_tree.item(item_id, 'values')
-        product = {
-            'id': values[1],
-            'name': values[2],
-            'category': values[3],
-            'type': values[4],
-            'price': float(values[5]),
-            'stock': int(values[6]) if values[6] else 0,
-            'unit': values[7],
-            'description': values[8]
-        }
+        # Row iids are product ids, so edit the stored product rather than re-parsing the row text
+        product = self.app.products_by_id.get(selected[0])
+        if product is None:
+            return
         EditProductDialog(self, product, self.update_product, categories=CATEGORIES)
 
     def update_product(self, old_id, new_data):
-        for i, p in enumerate(self.products):
-            if p['id'] == old_id:
-                self.products[i] = new_data
-                break
-        self.refresh_prod_list()
+        cache_display_strings(new_data)
+        old = self.app.products_by_id.pop(old_id, None)
+        if old is not None:
+            # Look up the product through the id index; list.index then finds its slot in C
+            self.app.products[self.app.products.index(old)] = new_data
+        new_id = new_data['id']
+        if new_id != old_id and new_id in self.app.products_by_id:
+            self.app.products_by_id[new_id] = new_data
+            self.refresh_prod_list()  # Renamed onto an existing id: rebuild the rows
+            return
+        self.app.products_by_id[new_id] = new_data
+        # Replace only the edited row, keeping its position
+        index = self.prod_tree.index(old_id)
+        self._shown_ids.discard(old_id)
+        self.prod_tree.delete(old_id)
+        self.insert_prod_row(new_data, index)
 
     def save(self):
-        if self.save_callback():
+        if self.app.save_products():
             messagebox.showinfo("Success", "Items saved successfully.")
             self.refresh_callback()
         else:
@@ -941,51 +1555,67 @@ class ProductManager(tk.Toplevel):
         file_path = filedialog.askopenfilename(title="Import Items", filetypes=[("Text Files", "*.txt"), ("JSON Files", "*.json"), ("All Files", "*.*")])
         if not file_path:
             return
+        imported = 0
         try:
-            imported = 0
+            # Duplicate ids are checked against the app's id index, which is updated as rows are added
+            by_id = self.app.products_by_id
+            append = self.app.products.append
+            data = None
             if file_path.endswith('.json'):
-                import json
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    if isinstance(data, list):
-                        for item in data:
-                            prod_id = item.get('id') or item.get('product_id') or f"prod_{uuid.uuid4().hex[:8]}"
-                            name = item.get('name', 'Unknown')
-                            category = item.get('category', '')
-                            type_ = item.get('type', 'product')
-                            price = float(item.get('price', 0.0))
-                            stock = int(item.get('stock', 0))
-                            unit = item.get('unit', 'pcs')
-                            description = item.get('description', '')
-                            if not any(p['id'] == prod_id for p in self.products):
-                                self.products.append({'id': prod_id, 'name': name, 'category': category, 'type': type_, 'price': price, 'stock': stock, 'unit': unit, 'description': description})
+                with open(file_path, 'rb') as f:
+                    data = json_loads(f.read())
+            if isinstance(data, list):
+                source = "JSON"
+                new_ids = new_product_ids()
+                # Collect the new rows and add them in one extend; a bad row leaves the catalog untouched
+                new_items = []
+                seen = set()
+                for item in data:
+                    prod_id = item.get('id') or item.get('product_id') or next(new_ids)
+                    name = item.get('name', 'Unknown')
+                    category = item.get('category', '')
+                    type_ = item.get('type', 'product')
+                    price = float(item.get('price', 0.0))
+                    stock = int(item.get('stock', 0))
+                    unit = item.get('unit', 'pcs')
+                    description = item.get('description', '')
+                    if prod_id not in by_id and prod_id not in seen:
+                        seen.add(prod_id)
+                        new_items.append(cache_display_strings({'id': prod_id, 'name': name, 'category': category, 'type': type_, 'price': price, 'stock': stock, 'unit': unit, 'description': description}))
+                self.app.products.extend(new_items)
+                by_id.update((p['id'], p) for p in new_items)
+                imported = len(new_items)
+            else:
+                source = "text file"
+                # Try pipe-delimited text; a 1 MiB buffer keeps large dumps to a few read calls
+                with open(file_path, 'r', encoding='utf-8', buffering=1 << 20) as f:
+                    for line in f:
+                        if not line.strip(): continue
+                        parts = line.strip().split('|')
+                        if len(parts) == 4:
+                            prod_id, name, price, stock = parts[:4]
+                            if prod_id not in by_id:
+                                product = {'id': prod_id, 'name': name, 'category': '', 'type': 'product', 'price': float(price), 'stock': int(stock), 'unit': 'pcs', 'description': ''}
+                                append(product)
+                                by_id[prod_id] = cache_display_strings(product)
+                                imported += 1
+                        elif len(parts) >= 8:
+                            prod_id, name, category, type_, price, stock, unit, description = parts[:8]
+                            if prod_id not in by_id:
+                                product = {'id': prod_id, 'name': name, 'category': category, 'type': type_, 'price': float(price), 'stock': int(stock), 'unit': unit, 'description': description}
+                                append(product)
+                                by_id[prod_id] = cache_display_strings(product)
                                 imported += 1
-                        self.refresh_prod_list()
-                        self.save_callback()
-                        self.refresh_callback()
-                        messagebox.showinfo("Import Complete", f"Imported {imported} items from JSON.")
-                        return
-            # Try pipe-delimited text
-            with open(file_path, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if not line.strip(): continue
-                    parts = line.strip().split('|')
-                    if len(parts) == 4:
-                        prod_id, name, price, stock = parts[:4]
-                        if not any(p['id'] == prod_id for p in self.products):
-                            self.products.append({'id': prod_id, 'name': name, 'category': '', 'type': 'product', 'price': float(price), 'stock': int(stock), 'unit': 'pcs', 'description': ''})
-                            imported += 1
-                    elif len(parts) >= 8:
-                        prod_id, name, category, type_, price, stock, unit, description = parts[:8]
-                        if not any(p['id'] == prod_id for p in self.products):
-                            self.products.append({'id': prod_id, 'name': name, 'category': category, 'type': type_, 'price': float(price), 'stock': int(stock), 'unit': unit, 'description': description})
-                            imported += 1
-            self.refresh_prod_list()
-            self.save_callback()
-            self.refresh_callback()
-            messagebox.showinfo("Import Complete", f"Imported {imported} items from text file.")
         except Exception as e:
             messagebox.showerror("Import Error", f"Failed to import items: {e}")
+            return
+        finally:
+            # One refresh and one save per import, including rows added before an error
+            if imported:
+                self.refresh_prod_list()
+                self.app.save_products()
+                self.refresh_callback()
+        messagebox.showinfo("Import Complete", f"Imported {imported} items from {source}.")
 
 class EditProductDialog(tk.Toplevel):
     def __init__(self, parent, product, callback, categories=None):
@@ -997,16 +1627,18 @@ class EditProductDialog(tk.Toplevel):
         self.callback = callback
         self.old_id = product['id'] if product else None
         self.categories = categories if categories else []
+        self._categories_set = set(self.categories)  # For membership tests; kept in step with the list
         # Fields
-        self.id_var = tk.StringVar(value=product['id'] if product else f"prod_{uuid.uuid4().hex[:8]}")
+        self.id_var = tk.StringVar(value=product['id'] if product else f"prod_{secrets.token_hex(4)}")
         self.name_var = tk.StringVar(value=product['name'] if product else "")
         self.main_category_var = tk.StringVar(value=product['category'] if product else "")
-        self.sub_category_var = tk.StringVar(value=product['subcategory'] if product else "")
+        self.sub_category_var = tk.StringVar(value=product.get('category_sub', '') if product else "")
         self.type_var = tk.StringVar(value=product['type'] if product else "product")
         self.price_var = tk.StringVar(value=str(product['price']) if product else "0.0")
-        self.stock_var = tk.StringVar(value=str(product['stock']) if product and product['type'] == 'product' else "0")
-        self.unit_var = tk.StringVar(value=product['unit'] if product and product['type'] == 'product' else "pcs")
-        self.description_var = tk.StringVar(value=product['description'] if product else "")
+        is_product = bool(product) and product['type'] == 'product'
+        self.stock_var = tk.StringVar(value=str(product.get('stock', 0)) if is_product else "0")
+        self.unit_var = tk.StringVar(value=product.get('unit', 'pcs') if is_product else "pcs")
+        self.description_var = tk.StringVar(value=product.get('description', '') if product else "")
         # Layout
         row = 0
         tk.Label(self, text="Product ID:").grid(row=row, column=0, sticky='e', padx=10, pady=8)
@@ -1020,8 +1652,9 @@ class EditProductDialog(tk.Toplevel):
         self.main_category_combo.grid(row=row, column=1, sticky='w', padx=10, pady=8)
         row += 1
         tk.Label(self, text="Sub Category:").grid(row=row, column=0, sticky='e', padx=10, pady=8)
-        self.sub_category_combo = ttk.Combobox(self, textvariable=self.sub_category_var, values=CATEGORY_TREE.get(self.main_category_var.get(), []), state="readonly")
+        self.sub_category_combo = ttk.Combobox(self, textvariable=self.sub_category_var, values=get_category_choices().get(self.main_category_var.get(), ()), state="readonly")
         self.sub_category_combo.grid(row=row, column=1, sticky='w', padx=10, pady=8)
+        self.main_category_combo.bind("<<ComboboxSelected>>", self.update_sub_categories)
         row += 1
         tk.Label(self, text="Type:").grid(row=row, column=0, sticky='e', padx=10, pady=8)
         type_combo = ttk.Combobox(self, textvariable=self.type_var, values=["product", "service", "subscription", "booking", "digital"], state="readonly")
@@ -1046,6 +1679,11 @@ class EditProductDialog(tk.Toplevel):
         row += 1
         ttk.Button(self, text="Save", command=self.save).grid(row=row, column=0, columnspan=2, pady=20)
         self.toggle_fields()
+    def update_sub_categories(self, event=None):
+        subs = get_category_choices().get(self.main_category_var.get(), ())
+        self.sub_category_combo.configure(values=subs)
+        if self.sub_category_var.get() not in subs:
+            self.sub_category_var.set('')
     def toggle_fields(self, event=None):
         t = self.type_var.get()
         if t == 'product':
@@ -1064,7 +1702,8 @@ class EditProductDialog(tk.Toplevel):
             'id': self.id_var.get(),
             'name': self.name_var.get(),
             'category': self.main_category_var.get(),
-            'subcategory': self.sub_category_var.get(),
+            'category_main': self.main_category_var.get(),
+            'category_sub': self.sub_category_var.get(),
             'type': t,
             'price': float(self.price_var.get()),
             'stock': int(self.stock_var.get()) if t == 'product' else 0,
@@ -1072,7 +1711,8 @@ class EditProductDialog(tk.Toplevel):
             'description': self.description_var.get()
         }
         # Add new category to the session list if not present
-        if new_data['category'] and new_data['category'] not in self.categories:
+        if new_data['category'] and new_data['category'] not in self._categories_set:
+            self._categories_set.add(new_data['category'])
             self.categories.append(new_data['category'])
             self.main_category_combo['values'] = self.categories
         self.callback(self.old_id, new_data)
@@ -1080,7 +1720,10 @@ class EditProductDialog(tk.Toplevel):
 
 class PaymentDialog(tk.Toplevel):
     """Dialog for entering cash tendered and calculating change."""
-    def __init__(self, parent, total, callback):
+    INSUFFICIENT_FUNDS = "Cash tendered is less than the total amount."
+    INVALID_INPUT = "Please enter a valid number for cash tendered."
+
+    def __init__(self, parent, total, callback, fonts):
         super().__init__(parent)
         self.title("Payment")
         self.geometry("350x200")
@@ -1092,10 +1735,10 @@ class PaymentDialog(tk.Toplevel):
 
         self.configure(bg=COLORS['light_bg'])
         
-        ttk.Label(self, text=f"Total Due: {CONFIG['currency_symbol']}{total:.2f}", font=('Segoe UI', 14, 'bold')).pack(pady=10)
+        ttk.Label(self, text=f"Total Due: {CURRENCY}{total:.2f}", font=fonts['total']).pack(pady=10)
         
-        ttk.Label(self, text="Cash Tendered:", font=('Segoe UI', 10)).pack(pady=(10,0))
-        self.tendered_entry = ttk.Entry(self, font=('Segoe UI', 12))
+        ttk.Label(self, text="Cash Tendered:", font=fonts['body']).pack(pady=(10,0))
+        self.tendered_entry = ttk.Entry(self, font=fonts['large'])
         self.tendered_entry.pack(pady=5, padx=20, fill='x')
         self.tendered_entry.focus_set()
 
@@ -1105,20 +1748,20 @@ class PaymentDialog(tk.Toplevel):
         self.bind('<Return>', lambda e: self.process())
 
     def process(self):
+        total = self.total
         try:
             tendered = float(self.tendered_entry.get())
-            if tendered < self.total:
-                messagebox.showerror("Insufficient Funds", "Cash tendered is less than the total amount.", parent=self)
-                return
-            
-            change = tendered - self.total
-            messagebox.showinfo("Payment Complete", f"Change Due: {CONFIG['currency_symbol']}{change:.2f}", parent=self)
-            
-            self.callback(self.total, tendered) # Finalize the sale
-            self.destroy()
-
         except ValueError:
-            messagebox.showerror("Invalid Input", "Please enter a valid number for cash tendered.", parent=self)
+            messagebox.showerror("Invalid Input", self.INVALID_INPUT, parent=self)
+            return
+        if tendered < total:
+            messagebox.showerror("Insufficient Funds", self.INSUFFICIENT_FUNDS, parent=self)
+            return
+
+        messagebox.showinfo("Payment Complete", f"Change Due: {CURRENCY}{tendered - total:.2f}", parent=self)
+
+        self.callback(total, tendered) # Finalize the sale
+        self.destroy()
 
 class ReceiptWindow(tk.Toplevel):
     """A window to display a formatted virtual receipt."""
@@ -1132,31 +1775,38 @@ class ReceiptWindow(tk.Toplevel):
         receipt_text.pack(padx=20, pady=20, fill='both', expand=True)
 
         # --- Build Receipt String ---
-        receipt = f"*** SALE RECEIPT ***\n\n"
-        receipt += f"Sale ID: {sale_record['sale_id']}\n"
-        receipt += f"Date: {datetime.datetime.fromisoformat(sale_record['timestamp']).strftime('%Y-%m-%d %H:%M:%S')}\n"
-        receipt += "-"*40 + "\n"
+        # Fresh sales carry their datetime; sales read back from the log only have the ISO string
+        sold_at = sale_record.get('_timestamp_dt') or datetime.datetime.fromisoformat(sale_record['timestamp'])
+        parts = [
+            RECEIPT_HEADER,
+            f"Sale ID: {sale_record['sale_id']}\n",
+            f"Date: {sold_at.strftime('%Y-%m-%d %H:%M:%S')}\n",
+            RECEIPT_RULE,
+        ]
         
         # Items
-        for item in sale_record['items']:
-            line_total = item['price'] * item['quantity']
-            receipt += f"{item['name']:<25} {item['quantity']}x {item['price']:.2f} {line_total:>8.2f}\n"
-        
-        receipt += "-"*40 + "\n"
+        parts.extend(
+            f"{item['name']:<25} {item['quantity']}x {item['price']:.2f} {item['price'] * item['quantity']:>8.2f}\n"
+            for item in sale_record['items']
+        )
         
         # Totals
-        receipt += f"{'Subtotal:':>30} {sale_record['subtotal']:>8.2f}\n"
-        receipt += f"{'Tax:':>30} {sale_record['tax']:>8.2f}\n"
-        receipt += f"{'Total:':>30} {sale_record['total']:>8.2f}\n"
-        receipt += "-"*40 + "\n"
+        parts += [
+            RECEIPT_RULE,
+            f"{'Subtotal:':>30} {sale_record['subtotal']:>8.2f}\n",
+            f"{'Tax:':>30} {sale_record['tax']:>8.2f}\n",
+            f"{'Total:':>30} {sale_record['total']:>8.2f}\n",
+            RECEIPT_RULE,
+        ]
         
         # Payment
-        receipt += f"{'Cash Tendered:':>30} {sale_record['cash_tendered']:>8.2f}\n"
-        receipt += f"{'Change Due:':>30} {sale_record['cash_tendered'] - sale_record['total']:>8.2f}\n\n"
-        
-        receipt += "*** Thank You! ***"
+        parts += [
+            f"{'Cash Tendered:':>30} {sale_record['cash_tendered']:>8.2f}\n",
+            f"{'Change Due:':>30} {sale_record['cash_tendered'] - sale_record['total']:>8.2f}\n\n",
+            RECEIPT_FOOTER,
+        ]
 
-        receipt_text.insert('1.0', receipt)
+        receipt_text.insert('1.0', ''.join(parts))
         receipt_text.config(state='disabled') # Make it read-only
 
 class CategoryManagerDialog(tk.Toplevel):
@@ -1166,6 +1816,10 @@ class CategoryManagerDialog(tk.Toplevel):
         self.geometry('500x400')
         self.category_tree = category_tree
         self.on_save = on_save
+        # (main, sub) -> color / icon; sub is None for a main category. Placeholders: categories have no
+        # colors or icons yet (set_color / set_icon are stubs), so these stay empty and lookups return ''
+        self._color_cache = {}
+        self._icon_cache = {}
         self.tree = ttk.Treeview(self, columns=('Color', 'Icon'))
         self.tree.heading('#0', text='Main Category')
         self.tree.heading('Color', text='Color')
@@ -1183,16 +1837,17 @@ class CategoryManagerDialog(tk.Toplevel):
         ttk.Button(btn_frame, text='Save', command=self.save).pack(side='right', padx=5)
     def populate_tree(self):
         self.tree.delete(*self.tree.get_children())
+        insert = self.tree.insert
+        colors = self._color_cache
+        icons = self._icon_cache
         for main, subs in self.category_tree.items():
-            main_id = self.tree.insert('', 'end', text=main, values=(self.get_color(main), self.get_icon(main)))
+            main_id = insert('', 'end', text=main, values=(colors.get((main, None), ''), icons.get((main, None), '')))
             for sub in subs:
-                self.tree.insert(main_id, 'end', text=sub, values=(self.get_color(main, sub), self.get_icon(main, sub)))
+                insert(main_id, 'end', text=sub, values=(colors.get((main, sub), ''), icons.get((main, sub), '')))
     def get_color(self, main, sub=None):
-        # Placeholder: return color from category data
-        return ''
+        return self._color_cache.get((main, sub), '')
     def get_icon(self, main, sub=None):
-        # Placeholder: return icon from category data
-        return ''
+        return self._icon_cache.get((main, sub), '')
     def add_main(self): pass
     def add_sub(self): pass
     def rename_cat(self): pass
@@ -10,6 +10,8 @@ class Product:
     :param type: 'product', 'service', 'subscription', 'booking', 'digital'
     :param unit: Unit of measure (for tangible products)
     """
+    __slots__ = ("product_id", "name", "category", "price", "stock", "description", "type", "unit")
+
     def __init__(self, product_id: str, name: str, category: str, price: float, stock: int = 0, description: str = "", type: str = "product", unit: str = "pcs"):
         self.product_id = product_id
         self.name = name
@@ -49,6 +51,8 @@ class CartItem:
     """
     Represents an item in the shopping cart.
     """
+    __slots__ = ("product", "quantity")
+
     def __init__(self, product: Product, quantity: int):
         self.product = product
         self.quantity = quantity